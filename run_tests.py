@@ -1,10 +1,213 @@
 #!/usr/bin/env python
 """Simple test runner that bypasses pytest to avoid ROS plugin conflicts."""
 
+import functools
+import io
+import pickle
+import queue
+import shelve
 import sys
+import threading
 import time
-from datasets import load_dataset, get_dataset_config_names
-import numpy as np
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+# datasets, huggingface_hub and numpy are imported where they are used so
+# that starting the runner (and failing fast on setup errors) doesn't pay
+# for them up front.
+
+REPO_ID = "OpenDataDetector/ColliderML_ttbar_pu0"
+
+# Streams hand back events as numpy arrays built straight from the Arrow
+# columns; it is also recorded in the cache so events stored in another
+# format are refetched.
+EVENT_FORMAT = "numpy"
+
+# First events are persisted here so reruns against the same dataset
+# revision don't touch the network at all.
+CACHE_PATH = Path.home() / ".cache" / "colliderml_tests" / "first_events"
+
+_DATASETS = {}
+
+# Tests run concurrently, so shared caches are guarded: one global lock
+# for the dicts themselves and one per config so that a config is only
+# ever fetched once.
+_CACHE_LOCK = threading.Lock()
+_CONFIG_LOCKS = {}
+
+_SENTINEL = object()
+
+
+@functools.lru_cache(maxsize=1)
+def _repo_revision():
+    """Return the commit hash of the dataset repo, or None if unavailable."""
+    from huggingface_hub import HfApi
+
+    try:
+        return HfApi().dataset_info(REPO_ID).sha
+    except Exception as e:
+        print(f"Warning: Could not fetch dataset revision: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _config_names(repo, revision):
+    """Discover configs once per (repo, revision)."""
+    from datasets import get_dataset_config_names
+
+    return get_dataset_config_names(repo, revision=revision)
+
+
+def _get_configs():
+    """Get all available configs for the dataset."""
+    return _config_names(REPO_ID, _repo_revision())
+
+
+def _config_lock(config):
+    """Get the lock serializing fetches for a config."""
+    with _CACHE_LOCK:
+        return _CONFIG_LOCKS.setdefault(config, threading.RLock())
+
+
+def _get_stream(config):
+    """Get the streaming dataset for a config, reusing it across tests."""
+    from datasets import load_dataset
+
+    with _config_lock(config):
+        if config not in _DATASETS:
+            _DATASETS[config] = load_dataset(
+                REPO_ID,
+                config,
+                split="train",
+                streaming=True,
+                revision=_repo_revision(),
+            ).with_format(EVENT_FORMAT)
+        return _DATASETS[config]
+
+
+def _cached_first_event(config, revision):
+    """Look up a persisted first event for this revision."""
+    with _CACHE_LOCK, shelve.open(str(CACHE_PATH)) as cache:
+        if cache.get("revision") != revision or cache.get("format") != EVENT_FORMAT:
+            return None
+        return cache.get(config)
+
+
+def _store_first_event(config, revision, event):
+    """Persist a first event, dropping entries from older revisions."""
+    with _CACHE_LOCK, shelve.open(
+        str(CACHE_PATH), protocol=pickle.HIGHEST_PROTOCOL
+    ) as cache:
+        if cache.get("revision") != revision or cache.get("format") != EVENT_FORMAT:
+            cache.clear()
+            cache["revision"] = revision
+            cache["format"] = EVENT_FORMAT
+        cache[config] = event
+
+
+@functools.lru_cache(maxsize=None)
+def _first_event(config):
+    """Get the first event of a config, from cache when possible."""
+    revision = _repo_revision()
+    if revision is None:
+        return next(iter(_get_stream(config)))
+
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with _config_lock(config):
+        event = _cached_first_event(config, revision)
+        if event is None:
+            event = next(iter(_get_stream(config)))
+            _store_first_event(config, revision, event)
+    return event
+
+
+def _prefetch(iterable, n=2):
+    """Yield items from ``iterable`` while a background thread fetches ahead.
+
+    Up to ``n`` items are buffered, so the next event is downloading while
+    the current one is being checked.
+    """
+    q = queue.Queue(maxsize=n)
+    stop = threading.Event()
+
+    def put(item):
+        # Poll so the producer notices when the consumer has gone away.
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except Exception as e:
+            put((_SENTINEL, e))
+        else:
+            put((_SENTINEL, None))
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item, error = q.get()
+            if item is _SENTINEL:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def _describe(value):
+    """Return (min, max, mean, std) of a numeric array.
+
+    The std is taken from deviations about the mean, so fields on a large
+    offset (IDs, barcodes) keep their precision, and the deviations feed a
+    single dot product instead of the extra temporaries of np.std.
+    """
+    import numpy as np
+
+    a = np.asarray(value).ravel()
+    mean = a.mean(dtype=np.float64)
+    deviations = a - mean
+    std = np.sqrt(np.dot(deviations, deviations) / a.size)
+    return a.min(), a.max(), mean, std
+
+
+class _ThreadLocalStdout(io.TextIOBase):
+    """Send writes from each test thread to that thread's own buffer."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def capture(self):
+        """Start buffering everything the calling thread prints."""
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+
+    def write(self, s):
+        buffer = getattr(self._local, "buffer", None)
+        return (self._stream if buffer is None else buffer).write(s)
+
+    def flush(self):
+        self._stream.flush()
+
+
+def _run_test(test_func, stdout):
+    """Run a test, returning its captured output and traceback (if failed)."""
+    buffer = stdout.capture()
+    try:
+        test_func()
+    except Exception:
+        return buffer.getvalue(), traceback.format_exc()
+    return buffer.getvalue(), None
 
 
 def test_config_discovery():
@@ -13,7 +216,7 @@ def test_config_discovery():
     print("TEST: Config Discovery")
     print("="*60)
 
-    configs = get_dataset_config_names("OpenDataDetector/ColliderML_ttbar_pu0")
+    configs = _get_configs()
     print(f"\n✓ Discovered {len(configs)} configs:")
     for config in configs:
         print(f"  - {config}")
@@ -33,14 +236,7 @@ def test_streaming_single_event():
     print("="*60)
 
     start = time.time()
-    dataset = load_dataset(
-        "OpenDataDetector/ColliderML_ttbar_pu0",
-        "particles",
-        split="train",
-        streaming=True
-    )
-
-    first_event = next(iter(dataset))
+    first_event = _first_event("particles")
     elapsed = time.time() - start
 
     print(f"\n✓ Loaded 1 event in {elapsed:.2f}s")
@@ -54,34 +250,32 @@ def test_streaming_single_event():
 
 def test_all_configs():
     """Test all available configs."""
+    import numpy as np
+
     print("\n" + "="*60)
     print("TEST: All Configs")
     print("="*60)
 
-    configs = get_dataset_config_names("OpenDataDetector/ColliderML_ttbar_pu0")
+    configs = _get_configs()
+
+    # Fetch every config's first event in parallel before inspecting them
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=len(configs)) as ex:
+        first_events = dict(zip(configs, ex.map(_first_event, configs)))
+    elapsed = time.time() - start
+    print(f"\n✓ Loaded first event of {len(configs)} configs in {elapsed:.2f}s")
 
     for config in configs:
         print(f"\nTesting config: {config}")
-        start = time.time()
-
-        dataset = load_dataset(
-            "OpenDataDetector/ColliderML_ttbar_pu0",
-            config,
-            split="train",
-            streaming=True
-        )
+        first_event = first_events[config]
 
-        first_event = next(iter(dataset))
-        elapsed = time.time() - start
-
-        print(f"  ✓ Loaded in {elapsed:.2f}s")
         print(f"  Fields ({len(first_event.keys())}): {list(first_event.keys())}")
 
         # Inspect data types
         for key, value in first_event.items():
-            if hasattr(value, 'shape'):
+            if isinstance(value, np.ndarray):
                 print(f"    - {key}: shape={value.shape}, dtype={value.dtype}")
-            elif hasattr(value, '__len__'):
+            elif isinstance(value, (list, tuple, dict, bytes, str)):
                 print(f"    - {key}: length={len(value)}")
 
         assert first_event is not None
@@ -93,31 +287,27 @@ def test_all_configs():
 
 def test_particle_data_inspection():
     """Test detailed particle data inspection."""
+    import numpy as np
+
     print("\n" + "="*60)
     print("TEST: Particle Data Inspection")
     print("="*60)
 
     start = time.time()
-    dataset = load_dataset(
-        "OpenDataDetector/ColliderML_ttbar_pu0",
-        "particles",
-        split="train",
-        streaming=True
-    )
-
-    event = next(iter(dataset))
+    event = _first_event("particles")
     elapsed = time.time() - start
 
     print(f"\n✓ Loaded particle event in {elapsed:.2f}s")
     print("\nNumerical field statistics:")
 
     for key, value in event.items():
-        if hasattr(value, 'dtype') and np.issubdtype(value.dtype, np.number):
+        if isinstance(value, np.ndarray) and np.issubdtype(value.dtype, np.number):
             if value.size > 0:
+                vmin, vmax, mean, std = _describe(value)
                 print(f"\n  {key}:")
                 print(f"    Shape: {value.shape}, Dtype: {value.dtype}")
-                print(f"    Range: [{np.min(value):.3f}, {np.max(value):.3f}]")
-                print(f"    Mean: {np.mean(value):.3f}, Std: {np.std(value):.3f}")
+                print(f"    Range: [{vmin:.3f}, {vmax:.3f}]")
+                print(f"    Mean: {mean:.3f}, Std: {std:.3f}")
 
     return True
 
@@ -131,15 +321,10 @@ def test_multiple_events():
     num_events = 3
     start = time.time()
 
-    dataset = load_dataset(
-        "OpenDataDetector/ColliderML_ttbar_pu0",
-        "particles",
-        split="train",
-        streaming=True
-    )
+    dataset = _get_stream("particles")
 
     events_processed = 0
-    for i, event in enumerate(dataset):
+    for i, event in enumerate(_prefetch(dataset, n=3)):
         if i >= num_events:
             break
         assert event is not None
@@ -172,16 +357,29 @@ def main():
     failed = 0
     start_time = time.time()
 
-    for name, test_func in tests:
-        try:
-            test_func()
-            passed += 1
-        except Exception as e:
-            print(f"\n✗ FAILED: {name}")
-            print(f"  Error: {e}")
-            import traceback
-            traceback.print_exc()
-            failed += 1
+    # Every test is blocked on HTTPS almost all of the time, so run them
+    # side by side. Output is buffered per test and printed as each one
+    # finishes to keep the logs readable.
+    _repo_revision()
+    stdout = _ThreadLocalStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as ex:
+            futures = {
+                ex.submit(_run_test, test_func, stdout): name
+                for name, test_func in tests
+            }
+            for future in as_completed(futures):
+                output, error = future.result()
+                print(output, end="")
+                if error is None:
+                    passed += 1
+                else:
+                    print(f"\n✗ FAILED: {futures[future]}")
+                    print(error, end="")
+                    failed += 1
+    finally:
+        sys.stdout = stdout._stream
 
     total_time = time.time() - start_time
 
@@ -0,0 +1,155 @@
+"""Shared pytest configuration for the ColliderML tests."""
+
+import functools
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+DATASET_NAME = "OpenDataDetector/ColliderML_ttbar_pu0"
+
+HF_CACHE_DIR = Path(__file__).parent.parent / ".cache" / "hf"
+
+# Discovered configs are kept in pytest's cache so repeat runs skip the HF
+# API call. Set COLLIDERML_REFRESH_CONFIGS=1 (or pass --cache-clear) to
+# force a refresh.
+CONFIG_CACHE_KEY = f"colliderml/hf_configs/{DATASET_NAME}"
+CONFIG_CACHE_TTL = 24 * 60 * 60  # seconds
+
+
+def pytest_configure(config):
+    """Point HuggingFace at a persistent, repo-local cache.
+
+    This has to happen before the test modules import ``datasets``, which
+    reads these variables at import time. Anything already set in the
+    environment wins, including an ``HF_HOME`` that the specific cache
+    variables would otherwise override.
+    """
+    if "HF_HOME" not in os.environ:
+        os.environ.setdefault("HF_DATASETS_CACHE", str(HF_CACHE_DIR / "datasets"))
+        os.environ.setdefault("HF_HUB_CACHE", str(HF_CACHE_DIR / "hub"))
+    os.environ.setdefault("HF_HUB_DISABLE_TELEMETRY", "1")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-network",
+        action="store_true",
+        default=False,
+        help="skip tests marked 'network' without contacting HuggingFace",
+    )
+    parser.addoption(
+        "--bench",
+        action="store_true",
+        default=False,
+        help="report per-test timings",
+    )
+    parser.addoption(
+        "--update-baseline",
+        action="store_true",
+        default=False,
+        help="re-measure and rewrite tests/bench_baseline.json",
+    )
+
+
+# Discover available configs from HuggingFace
+@functools.lru_cache(maxsize=1)
+def _fetch_config_names():
+    """Ask the HF API for the ttbar configs; None if the call fails."""
+    # Imported here: datasets reads the cache variables set in
+    # pytest_configure at import time.
+    from datasets import get_dataset_config_names
+
+    try:
+        return get_dataset_config_names(DATASET_NAME)
+    except Exception as e:
+        print(f"Warning: Could not fetch configs from HF: {e}")
+        return None
+
+
+def get_available_configs(cache=None):
+    """Get all available configurations for the ttbar dataset.
+
+    ``cache`` is pytest's ``config.cache``; it is None when the cache
+    provider is disabled (``-p no:cacheprovider``).
+    """
+    if cache is not None and os.environ.get("COLLIDERML_REFRESH_CONFIGS") != "1":
+        cached = cache.get(CONFIG_CACHE_KEY, None)
+        if cached and time.time() - cached["timestamp"] < CONFIG_CACHE_TTL:
+            return cached["configs"]
+
+    configs = _fetch_config_names()
+    if configs is None:
+        # Fallback to known configs if API call fails
+        return ["particles", "tracker_hits", "calo_hits", "tracks"]
+
+    if cache is not None:
+        cache.set(CONFIG_CACHE_KEY, {"configs": configs, "timestamp": time.time()})
+    return configs
+
+
+def _network_disabled(config):
+    """Whether this run has opted out of network tests."""
+    markexpr = config.getoption("markexpr") or ""
+    return config.getoption("--no-network") or "not network" in markexpr
+
+
+def _discovered_configs(config):
+    """Configs to parametrize over; xdist workers use the controller's list."""
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None and "colliderml_configs" in workerinput:
+        return workerinput["colliderml_configs"]
+    if _network_disabled(config):
+        return []
+    return get_available_configs(getattr(config, "cache", None))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Discover configs once on the xdist controller and hand them to workers.
+
+    If each worker discovered on its own, one falling back to the hardcoded
+    list would collect different tests and xdist would abort the run.
+    """
+    node.workerinput["colliderml_configs"] = _discovered_configs(node.config)
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize per-config tests over the configs discovered on HuggingFace.
+
+    Discovery happens here rather than at import time so that offline runs
+    never make the API call. Only the config names are fetched here; event
+    data is fetched by the fixtures, so collection alone (``--collect-only``,
+    ``-k``, IDE discovery) downloads no shards.
+    """
+    if "config_and_first_event" not in metafunc.fixturenames:
+        return
+    metafunc.parametrize(
+        "config_and_first_event",
+        _discovered_configs(metafunc.config),
+        indirect=True,
+        scope="session",
+    )
+
+
+@pytest.fixture(scope="session")
+def available_configs(request):
+    """The configs discovered on HuggingFace for this run."""
+    return _discovered_configs(request.config)
+
+
+@pytest.fixture(scope="session")
+def bench(request):
+    """Whether per-test timings should be reported (``--bench``)."""
+    return request.config.getoption("--bench")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip network tests when running with --no-network."""
+    if not config.getoption("--no-network"):
+        return
+    skip_network = pytest.mark.skip(reason="network tests disabled (--no-network)")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip_network)